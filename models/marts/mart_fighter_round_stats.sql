@@ -0,0 +1,36 @@
+with
+    events          as (
+        select
+            event_uid,
+            title,
+            event_date
+        from {{ source('main', 'ufc_events') }}
+    ),
+    fighter_details as (
+        select
+            fighter_uid,
+            first_name,
+            last_name
+        from {{ source('main', 'ufc_fighters') }}
+    )
+select
+    e.title,
+    e.event_date,
+    a.round_num,
+    c.fighter_result,
+    b.first_name || ' ' || b.last_name as fighter_name,
+    d.first_name || ' ' || d.last_name as opponent_name,
+    a.total_strikes_landed,
+    a.total_strikes_attempted,
+    a.takedowns_landed,
+    a.takedowns_attempted
+from {{ source('main', 'ufc_fight_stats') }} a
+inner join {{ ref('int_fight_results_long') }} c
+    on a.fight_uid = c.fight_uid
+    and a.fighter_uid = c.fighter_uid
+inner join fighter_details b
+    on a.fighter_uid = b.fighter_uid
+inner join fighter_details d
+    on c.opponent_uid = d.fighter_uid
+inner join events e
+    on c.event_uid = e.event_uid
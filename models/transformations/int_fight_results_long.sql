@@ -0,0 +1,26 @@
+with
+    fights as (
+        select
+            event_uid,
+            fight_uid,
+            fighter1_uid,
+            fighter2_uid,
+            fighter1_result,
+            fighter2_result
+        from {{ source('main', 'ufc_fights') }}
+    )
+select
+    event_uid,
+    fight_uid,
+    fighter1_uid    as fighter_uid,
+    fighter2_uid    as opponent_uid,
+    fighter1_result as fighter_result
+from fights
+union all
+select
+    event_uid,
+    fight_uid,
+    fighter2_uid    as fighter_uid,
+    fighter1_uid    as opponent_uid,
+    fighter2_result as fighter_result
+from fights
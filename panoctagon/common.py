@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import os
 import random
+import tempfile
 import time
 from pathlib import Path
 from typing import Any, Optional, Type
 
 import bs4
+import pandas as pd
+import pyarrow as pa
 import requests
 from pydantic import BaseModel
 from sqlalchemy import Engine
@@ -38,13 +42,62 @@ class PanoctagonSetup(BaseModel):
     start_time: float
 
 
+def get_db_path() -> Path:
+    return Path(__file__).parent.parent / "data" / "panoctagon_orm.db"
+
+
 def get_engine() -> Engine:
-    db_path = Path(__file__).parent.parent / "data" / "panoctagon_orm.db"
+    db_path = get_db_path()
     engine_path = "sqlite:///" + str(db_path.resolve())
     engine = create_engine(engine_path, echo=False)
     return engine
 
 
+def read_sql_cached(
+    query: str, parse_dates: Optional[list[str]] = None
+) -> pd.DataFrame:
+    """
+    reads `query` from parquet if it was already run against the current db,
+    otherwise runs it and caches the result. cache files are keyed on the query
+    text and the db modification time so any write to the db invalidates them
+    """
+    db_path = get_db_path()
+    cache_dir = db_path.parent / "cache"
+    cache_dir.mkdir(exist_ok=True)
+
+    cache_key = f"{query}{parse_dates}"
+    query_hash = hashlib.sha256(cache_key.encode()).hexdigest()[:16]
+    db_mtime = db_path.stat().st_mtime_ns
+    cache_path = cache_dir / f"{query_hash}_{db_mtime}.parquet"
+    if cache_path.exists():
+        # another worker may replace the file between the check and the read, and
+        # a truncated or corrupt file should be rebuilt rather than block startup
+        try:
+            return pd.read_parquet(cache_path)
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+    df = pd.read_sql_query(query, get_engine(), parse_dates=parse_dates)
+
+    for stale_path in cache_dir.glob(f"{query_hash}_*.parquet"):
+        if stale_path == cache_path:
+            continue
+        stale_path.unlink(missing_ok=True)
+
+    # write to a uniquely named file then rename so other workers never read a
+    # partial file - pids are not unique across replicas sharing the volume
+    with tempfile.NamedTemporaryFile(
+        dir=cache_dir, prefix=f"{query_hash}_", suffix=".tmp", delete=False
+    ) as tmp_file:
+        tmp_path = Path(tmp_file.name)
+    try:
+        df.to_parquet(tmp_path)
+        tmp_path.replace(cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return df
+
+
 def delete_existing_records(
     tbl_model: Type[SQLModel], uid_col: Mapped[Any], uids: list[str]
 ) -> None:
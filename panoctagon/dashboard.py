@@ -1,137 +1,81 @@
+from functools import lru_cache
+
 from dash import Dash, dash_table, dcc, callback, Output, Input
 import pandas as pd
 import plotly.express as px
 import dash_mantine_components as dmc
-from panoctagon.common import get_engine
+from sqlalchemy.exc import OperationalError
+from panoctagon.common import read_sql_cached
 from typing import Any
 
 
-def get_tbl_cols() -> list[str]:
-    tbl_cols = [
-        "title",
-        "fighter_result",
-        "opponent_name",
-        "round_num",
-        "total_strikes_landed",
-        "total_strikes_attempted",
-        "takedowns_landed",
-        "takedowns_attempted",
-    ]
-    return tbl_cols
-
-
-# TODO: precompute this
-df = pd.read_sql_query(
-    """
-    with
-        event_details      as (
-            select
-                title,
-                event_date,
-                fight_uid
-            from ufc_events a
-            inner join ufc_fights b
-                on a.event_uid = b.event_uid
-        ),
-        fighter_details    as (
-            select
-                fighter_uid,
-                first_name,
-                last_name,
-                height_inches,
-                reach_inches
-            from ufc_fighters
-        ),
-        fight_results_long as (
-            select
-                fight_uid,
-                fighter1_uid    as fighter_uid,
-                fighter1_result as fighter_result
-            from ufc_fights
-            union
-            select
-                fight_uid,
-                fighter2_uid    as fighter_uid,
-                fighter2_result as fighter_result
-            from ufc_fights
-        ),
-        fs                 as (
-            select
-                a.fight_uid,
-                a.round_num,
-                a.fighter_uid,
-                c.fighter_result,
-                b.first_name || ' ' || b.last_name as fighter_name,
-                b.reach_inches,
-                b.height_inches,
-                total_strikes_landed,
-                total_strikes_attempted,
-                takedowns_landed,
-                takedowns_attempted
-            from ufc_fight_stats a
-            inner join fighter_details b
-                on a.fighter_uid = b.fighter_uid
-            inner join fight_results_long c
-                on a.fight_uid = c.fight_uid
-                and a.fighter_uid = c.fighter_uid
-        ),
-        opp_fs             as (
-            select
-                a.fight_uid,
-                a.round_num,
-                a.fighter_uid                      as opponent_uid,
-                c.fighter_result                   as opponent_result,
-                b.first_name || ' ' || b.last_name as opponent_name,
-                b.reach_inches                     as opponent_reach_inches,
-                b.height_inches                    as opponent_height_inches,
-                total_strikes_landed               as opponent_strikes_landed,
-                total_strikes_attempted            as opponent_strikes_attempted,
-                takedowns_landed                   as opponent_takedowns_landed,
-                takedowns_attempted                as opponent_takedowns_attempted
-            from ufc_fight_stats a
-            inner join fighter_details b
-                on a.fighter_uid = b.fighter_uid
-            inner join fight_results_long c
-                on a.fight_uid = c.fight_uid
-                and a.fighter_uid = c.fighter_uid
-
-        )
-    select
-        event_details.title,
-        event_details.event_date,
-        fs.fight_uid,
-        fs.round_num,
-        fighter_name,
-        fighter_result,
-        height_inches,
-        reach_inches,
-        total_strikes_landed,
-        total_strikes_attempted,
-        takedowns_landed,
-        takedowns_attempted,
-        opponent_name,
-        opponent_result,
-        opponent_reach_inches,
-        opponent_height_inches,
-        opponent_strikes_attempted,
-        opponent_strikes_landed,
-        opponent_takedowns_attempted,
-        opponent_takedowns_landed
-    from fs
-    inner join event_details
-        on fs.fight_uid = event_details.fight_uid
-    inner join opp_fs
-        on fs.fight_uid = opp_fs.fight_uid
-        and fs.round_num = opp_fs.round_num
-        and fs.fighter_uid != opp_fs.opponent_uid;
-    """,
-    get_engine(),
+TBL_COLS = [
+    "title",
+    "fighter_result",
+    "opponent_name",
+    "round_num",
+    "total_strikes_landed",
+    "total_strikes_attempted",
+    "takedowns_landed",
+    "takedowns_attempted",
+]
+GRAPH_METRICS = ["total_strikes_landed", "takedowns_landed"]
+
+try:
+    df = read_sql_cached(
+        """
+        select
+            title,
+            event_date,
+            round_num,
+            fighter_name,
+            fighter_result,
+            total_strikes_landed,
+            total_strikes_attempted,
+            takedowns_landed,
+            takedowns_attempted,
+            opponent_name
+        from mart_fighter_round_stats
+        """,
+        parse_dates=["event_date"],
+    )
+except OperationalError as e:
+    raise RuntimeError(
+        "could not read mart_fighter_round_stats - build the dbt models first with "
+        "`dbt deps --profiles-dir . && dbt build --profiles-dir .`"
+    ) from e
+
+# normalise once here so callbacks can compare names without re-running the
+# string ops over every row
+df["fighter_name"] = df["fighter_name"].str.strip().str.title()
+# sort once so every fighter partition is already in table order
+df = df.sort_values("event_date", ascending=False)
+# names, results and event titles repeat across every round of every fight
+df = df.astype(
+    {
+        "fighter_name": "category",
+        "opponent_name": "category",
+        "fighter_result": "category",
+        "title": "category",
+    }
 )
 
 initial_fighter = df.sample(1)["fighter_name"].item()
 if not isinstance(initial_fighter, str):
     raise TypeError()
 
+# the fighter name input fires on every keystroke - partition by fighter once so
+# each callback is a dict lookup instead of a scan over the full frame
+fighter_dfs: dict[str, pd.DataFrame] = {
+    str(name): fighter_df
+    for name, fighter_df in df.groupby("fighter_name", observed=True)
+}
+
+
+def get_fighter_df(fighter_name: str) -> pd.DataFrame:
+    return fighter_dfs.get(fighter_name, df.iloc[0:0])
+
+
 app = Dash(__name__)
 server=app.server
 
@@ -144,21 +88,19 @@ app.layout = dmc.Container(
             label="Fighter Name",
             id="fighter_name",
             value=initial_fighter,
+            debounce=300,
         ),
         dmc.RadioGroup(
-            [
-                dmc.Radio(i, value=i)
-                for i in ["total_strikes_landed", "takedowns_landed"]
-            ],
+            [dmc.Radio(i, value=i) for i in GRAPH_METRICS],
             id="my-dmc-radio-item",
-            value="total_strikes_landed",
+            value=GRAPH_METRICS[0],
             size="sm",
         ),
         dmc.Stack(
             [
                 dash_table.DataTable(
                     id="table-placeholder",
-                    columns=[{"name": i, "id": i} for i in df[get_tbl_cols()].columns],
+                    columns=[{"name": i, "id": i} for i in TBL_COLS],
                     sort_action="native",
                     filter_action="native",
                     style_table={
@@ -174,17 +116,10 @@ app.layout = dmc.Container(
 )
 
 
-@callback(
-    Output(component_id="table-placeholder", component_property="data"),
-    Input(component_id="fighter_name", component_property="value"),
-)
-def update_table(fighter_name: str) -> list[dict[Any, Any]]:
-    fighter_name = fighter_name.strip().title()
-    df_filtered = (
-        df.assign(fighter_name=lambda x: x.fighter_name.str.strip().str.title())  # type: ignore
-        .query(f"fighter_name == '{fighter_name}'")
-        .sort_values("event_date", ascending=False)
-    )[get_tbl_cols()]
+# the frame never changes after import, so results only depend on the inputs
+@lru_cache(maxsize=256)
+def get_fighter_table(fighter_name: str) -> list[dict[Any, Any]]:
+    df_filtered = get_fighter_df(fighter_name)[TBL_COLS]
 
     if df_filtered.empty:
         return [{}]
@@ -195,14 +130,9 @@ def update_table(fighter_name: str) -> list[dict[Any, Any]]:
     return df_filtered.to_dict("records")
 
 
-@callback(
-    Output(component_id="graph-placeholder", component_property="figure"),
-    Input(component_id="my-dmc-radio-item", component_property="value"),
-    Input(component_id="fighter_name", component_property="value"),
-)
-def update_graph(metric: str, fighter_name: str):
-    fighter_name = fighter_name.strip().title()
-    df_filtered = df[df["fighter_name"].str.strip().str.title() == fighter_name]
+@lru_cache(maxsize=256)
+def get_fighter_graph(metric: str, fighter_name: str) -> dict[str, Any]:
+    df_filtered = get_fighter_df(fighter_name)
 
     if df_filtered.empty:
         fig = px.strip(title=f"No data for {fighter_name}")
@@ -216,7 +146,26 @@ def update_graph(metric: str, fighter_name: str):
         )
 
     fig.update_layout(height=500)
-    return fig
+    # cache the plain dict so repeat hits skip the figure -> dict conversion
+    # dash would otherwise run on every response
+    return fig.to_dict()
+
+
+@callback(
+    Output(component_id="table-placeholder", component_property="data"),
+    Input(component_id="fighter_name", component_property="value"),
+)
+def update_table(fighter_name: str) -> list[dict[Any, Any]]:
+    return get_fighter_table(fighter_name.strip().title())
+
+
+@callback(
+    Output(component_id="graph-placeholder", component_property="figure"),
+    Input(component_id="my-dmc-radio-item", component_property="value"),
+    Input(component_id="fighter_name", component_property="value"),
+)
+def update_graph(metric: str, fighter_name: str) -> dict[str, Any]:
+    return get_fighter_graph(metric, fighter_name.strip().title())
 
 
 if __name__ == "__main__":
@@ -27,7 +27,7 @@ def main():
         parse_dates=["event_year", "last_refresh_timestamp"],
     )
 
-    last_refresh = df["last_refresh_timestamp"].to_list()[0].isoformat()
+    last_refresh = df["last_refresh_timestamp"].iloc[0].isoformat()
 
     title_text = "Striking Trends by Target, Fight Division"
     subtitle_text = f"last updated: {last_refresh}"
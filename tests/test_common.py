@@ -0,0 +1,118 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from panoctagon import common
+from panoctagon.common import read_sql_cached
+
+QUERY = "select event_uid, event_date from ufc_events"
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    db_path = tmp_path / "panoctagon_orm.db"
+    with sqlite3.connect(db_path) as con:
+        con.execute("create table ufc_events (event_uid text, event_date text)")
+        con.executemany(
+            "insert into ufc_events values (?, ?)",
+            [("a", "2024-01-01"), ("b", "2024-02-03")],
+        )
+
+    monkeypatch.setattr(common, "get_db_path", lambda: db_path)
+    return db_path
+
+
+def _get_cache_files(db_path: Path) -> list[Path]:
+    return sorted((db_path.parent / "cache").glob("*.parquet"))
+
+
+def _touch_db(db_path: Path) -> None:
+    stat = db_path.stat()
+    os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_read_sql_cached_reads_parquet_on_second_call(
+    db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = read_sql_cached(QUERY, parse_dates=["event_date"])
+    assert len(_get_cache_files(db_path)) == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("query should have been read from the cache")
+
+    monkeypatch.setattr(pd, "read_sql_query", _fail)
+    actual = read_sql_cached(QUERY, parse_dates=["event_date"])
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_read_sql_cached_invalidates_on_db_write(db_path: Path) -> None:
+    read_sql_cached(QUERY)
+    old_files = _get_cache_files(db_path)
+
+    _touch_db(db_path)
+    read_sql_cached(QUERY)
+    new_files = _get_cache_files(db_path)
+
+    assert len(new_files) == 1
+    assert new_files != old_files
+    assert not old_files[0].exists()
+
+
+def test_read_sql_cached_keys_on_parse_dates(db_path: Path) -> None:
+    raw = read_sql_cached(QUERY)
+    parsed = read_sql_cached(QUERY, parse_dates=["event_date"])
+
+    assert len(_get_cache_files(db_path)) == 2
+    assert raw["event_date"].dtype == object
+    assert pd.api.types.is_datetime64_any_dtype(parsed["event_date"])
+
+
+def test_read_sql_cached_parses_dates_on_both_paths(db_path: Path) -> None:
+    from_sql = read_sql_cached(QUERY, parse_dates=["event_date"])
+    from_cache = read_sql_cached(QUERY, parse_dates=["event_date"])
+
+    for df in [from_sql, from_cache]:
+        assert pd.api.types.is_datetime64_any_dtype(df["event_date"])
+
+
+def test_read_sql_cached_falls_back_when_cache_file_vanishes(
+    db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = read_sql_cached(QUERY, parse_dates=["event_date"])
+    cache_files = _get_cache_files(db_path)
+
+    def _vanished(*args, **kwargs):
+        raise FileNotFoundError()
+
+    monkeypatch.setattr(pd, "read_parquet", _vanished)
+    actual = read_sql_cached(QUERY, parse_dates=["event_date"])
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert _get_cache_files(db_path) == cache_files
+    assert not list((db_path.parent / "cache").glob("*.tmp"))
+
+
+def test_read_sql_cached_reruns_query_on_corrupt_cache_file(
+    db_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = read_sql_cached(QUERY, parse_dates=["event_date"])
+    [cache_path] = _get_cache_files(db_path)
+    cache_path.write_bytes(b"not a parquet file")
+
+    n_queries = 0
+    read_sql_query = pd.read_sql_query
+
+    def _count_queries(*args, **kwargs):
+        nonlocal n_queries
+        n_queries += 1
+        return read_sql_query(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_sql_query", _count_queries)
+    actual = read_sql_cached(QUERY, parse_dates=["event_date"])
+
+    assert n_queries == 1
+    pd.testing.assert_frame_equal(actual, expected)
+    pd.testing.assert_frame_equal(pd.read_parquet(cache_path), expected)